@@ -3,65 +3,100 @@ Interactive Chat Interface for SEO Expert Agent
 Provides a natural conversational interface to chat with the SEO expert.
 """
 
+import asyncio
 import os
+import re
 import sys
+import threading
+from collections import deque
 from seo_agent import SEOExpertAgent
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
+API_KEY = os.getenv("OPENAI_API_KEY")
+
+# Precompiled patterns used to pull structured data out of chat messages
+_QUOTED_RE = re.compile(r'"([^"]+)"')
+_KEYWORD_RE = re.compile(r'keyword[s]?[:\s]+([^\.\n]+)', re.IGNORECASE)
+_URL_RE = re.compile(r'https?://[^\s]+|www\.[^\s]+')
+_SPLIT_RE = re.compile(r'\s*,\s*')
+
+# Chat control words (compared against the lowered message)
+_EXIT = frozenset({'exit', 'quit', 'bye', 'goodbye'})
+_HELP = frozenset({'help', '?'})
+
+# Intent trigger phrases, in priority order (earlier intents win)
+_INTENTS = (
+    ('keyword', ['keyword', 'analyze keyword', 'keyword research', 'keywords']),
+    ('audit', ['audit', 'review content', 'check content', 'analyze content', 'seo audit']),
+    ('meta', ['meta description', 'meta desc', 'description']),
+    ('title', ['title tag', 'title', 'suggest title']),
+    ('competitor', ['competitor', 'analyze competitor', 'competitor analysis']),
+    ('report', ['seo report', 'report', 'audit report', 'website audit']),
+    ('local', ['local seo', 'local', 'local business', 'google business']),
+)
+
+_INTENT_PRIORITY = {name: index for index, (name, _) in enumerate(_INTENTS)}
+
+# One alternation with a named group per intent. The zero-width lookahead lets
+# finditer report overlapping phrases, so precedence doesn't depend on position.
+_INTENT_RE = re.compile('(?=' + '|'.join(
+    f'(?P<{name}>' + '|'.join(re.escape(phrase) for phrase in phrases) + ')'
+    for name, phrases in _INTENTS
+) + ')')
+
+
+_WELCOME = (
+    "\n" + "="*70 + "\n"
+    "🔍 SEO EXPERT AGENT - Chat Mode\n"
+    + "="*70 + "\n"
+    "\nHi! I'm your SEO expert assistant. I can help you with:\n"
+    "  • Keyword research and analysis\n"
+    "  • Content SEO audits and optimization\n"
+    "  • Meta descriptions and title tags\n"
+    "  • Local SEO strategies\n"
+    "  • Competitor analysis\n"
+    "  • SEO questions and best practices\n"
+    "\nJust chat with me naturally! Type 'exit' or 'quit' to end the conversation.\n"
+    + "-"*70 + "\n\n"
+)
+
+_HELP_TEXT = (
+    "\n" + "-"*70 + "\n"
+    "I can help you with various SEO tasks. Just ask naturally, for example:\n"
+    "  • 'Analyze keywords: python, web development'\n"
+    "  • 'What is keyword density?'\n"
+    "  • 'Generate meta description for: Python Guide'\n"
+    "  • 'Audit this content: [paste your content]'\n"
+    "  • 'Help me with local SEO for my restaurant in New York'\n"
+    + "-"*70 + "\n\n"
+)
 
 
 def print_welcome():
     """Print welcome message."""
-    print("\n" + "="*70)
-    print("🔍 SEO EXPERT AGENT - Chat Mode")
-    print("="*70)
-    print("\nHi! I'm your SEO expert assistant. I can help you with:")
-    print("  • Keyword research and analysis")
-    print("  • Content SEO audits and optimization")
-    print("  • Meta descriptions and title tags")
-    print("  • Local SEO strategies")
-    print("  • Competitor analysis")
-    print("  • SEO questions and best practices")
-    print("\nJust chat with me naturally! Type 'exit' or 'quit' to end the conversation.")
-    print("-"*70 + "\n")
-
-
-def detect_intent(user_input):
+    sys.stdout.write(_WELCOME)
+
+
+def print_help():
+    """Print chat usage examples."""
+    sys.stdout.write(_HELP_TEXT)
+
+
+def detect_intent(user_input, user_lower=None):
     """
     Detect user intent from natural language input.
+    Pass user_lower when the caller has already lowered the input.
     Returns a tuple (intent, extracted_data)
     """
-    user_lower = user_input.lower()
-    
-    # Keyword analysis intent
-    if any(word in user_lower for word in ['keyword', 'analyze keyword', 'keyword research', 'keywords']):
-        return 'keyword', None
-    
-    # Content audit intent
-    if any(word in user_lower for word in ['audit', 'review content', 'check content', 'analyze content', 'seo audit']):
-        return 'audit', None
-    
-    # Meta description intent
-    if any(word in user_lower for word in ['meta description', 'meta desc', 'description']):
-        return 'meta', None
+    if user_lower is None:
+        user_lower = user_input.lower()
     
-    # Title tag intent
-    if any(word in user_lower for word in ['title tag', 'title', 'suggest title']):
-        return 'title', None
-    
-    # Competitor analysis intent
-    if any(word in user_lower for word in ['competitor', 'analyze competitor', 'competitor analysis']):
-        return 'competitor', None
-    
-    # SEO report intent
-    if any(word in user_lower for word in ['seo report', 'report', 'audit report', 'website audit']):
-        return 'report', None
-    
-    # Local SEO intent
-    if any(word in user_lower for word in ['local seo', 'local', 'local business', 'google business']):
-        return 'local', None
+    # Scan once and keep the highest-priority intent that matched anywhere
+    priorities = [_INTENT_PRIORITY[match.lastgroup] for match in _INTENT_RE.finditer(user_lower)]
+    if priorities:
+        return _INTENTS[min(priorities)][0], None
     
     # General question
     return 'question', None
@@ -70,21 +105,19 @@ def detect_intent(user_input):
 def extract_keywords(user_input):
     """Extract keywords from user input."""
     # Simple extraction - look for patterns like "keywords: x, y, z" or quoted keywords
-    import re
     
     # Look for quoted keywords
-    quoted = re.findall(r'"([^"]+)"', user_input)
+    quoted = _QUOTED_RE.findall(user_input)
     if quoted:
         return quoted
     
     # Look for "keywords:" pattern
     if 'keyword' in user_input.lower():
         # Try to extract after "keyword" or "keywords"
-        match = re.search(r'keyword[s]?[:\s]+([^\.\n]+)', user_input, re.IGNORECASE)
+        match = _KEYWORD_RE.search(user_input)
         if match:
-            keywords_str = match.group(1).strip()
-            # Split by comma
-            keywords = [k.strip() for k in keywords_str.split(',')]
+            # Split by comma, trimming whitespace around each keyword
+            keywords = _SPLIT_RE.split(match.group(1).strip())
             return keywords[:5]  # Limit to 5 keywords
     
     return None
@@ -92,43 +125,72 @@ def extract_keywords(user_input):
 
 def extract_url(text):
     """Extract URL from text."""
-    import re
-    url_pattern = r'https?://[^\s]+|www\.[^\s]+'
-    matches = re.findall(url_pattern, text)
+    matches = _URL_RE.findall(text)
     return matches[0] if matches else None
 
 
-def chat_loop(agent):
+_INPUT_THREAD = "chat-input"
+
+
+def ainput(prompt=""):
+    """
+    Read a line from stdin without blocking the event loop.
+    The read runs on a daemon thread so a pending prompt never holds up exit;
+    main() skips interpreter teardown while that thread still owns stdin.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def resolve(setter, value):
+        if not future.done():
+            setter(value)
+    
+    def read():
+        try:
+            outcome = (future.set_result, input(prompt))
+        except BaseException as e:
+            outcome = (future.set_exception, e)
+        try:
+            loop.call_soon_threadsafe(resolve, *outcome)
+        except RuntimeError:
+            pass  # Loop already closed
+    
+    threading.Thread(target=read, name=_INPUT_THREAD, daemon=True).start()
+    return future
+
+
+def _input_pending():
+    """Whether an ainput() reader is still blocked in input()."""
+    return any(t.name == _INPUT_THREAD for t in threading.enumerate())
+
+
+async def chat_loop(agent):
     """Main chat loop."""
-    conversation_history = []
+    # Bounded so long sessions don't grow memory without limit
+    conversation_history = deque(maxlen=256)
     
     while True:
         try:
             # Get user input
-            user_input = input("\nYou: ").strip()
+            user_input = (await ainput("\nYou: ")).strip()
             
             if not user_input:
                 continue
             
+            user_lower = user_input.lower()
+            
             # Check for exit
-            if user_input.lower() in ['exit', 'quit', 'bye', 'goodbye']:
+            if user_lower in _EXIT:
                 print("\n👋 Thanks for chatting! Good luck with your SEO optimization!\n")
                 break
             
             # Check for help
-            if user_input.lower() in ['help', '?']:
-                print("\n" + "-"*70)
-                print("I can help you with various SEO tasks. Just ask naturally, for example:")
-                print("  • 'Analyze keywords: python, web development'")
-                print("  • 'What is keyword density?'")
-                print("  • 'Generate meta description for: Python Guide'")
-                print("  • 'Audit this content: [paste your content]'")
-                print("  • 'Help me with local SEO for my restaurant in New York'")
-                print("-"*70 + "\n")
+            if user_lower in _HELP:
+                print_help()
                 continue
             
             # Detect intent
-            intent, _ = detect_intent(user_input)
+            intent, _ = detect_intent(user_input, user_lower)
             
             # Process based on intent
             print("\n🤔 Thinking...")
@@ -137,41 +199,41 @@ def chat_loop(agent):
                 keywords = extract_keywords(user_input)
                 if keywords:
                     print(f"📊 Analyzing keywords: {', '.join(keywords)}")
-                    result = agent.analyze_keywords(keywords)
+                    result = await agent.analyze_keywords(keywords)
                     print(f"\n{result['analysis']}")
                 else:
                     # Ask for keywords
                     print("I'd be happy to analyze keywords for you!")
                     print("Please provide the keywords you'd like me to analyze (comma-separated):")
-                    keywords_input = input("Keywords: ").strip()
+                    keywords_input = (await ainput("Keywords: ")).strip()
                     if keywords_input:
-                        keywords = [k.strip() for k in keywords_input.split(',')]
-                        result = agent.analyze_keywords(keywords)
+                        keywords = _SPLIT_RE.split(keywords_input)
+                        result = await agent.analyze_keywords(keywords)
                         print(f"\n{result['analysis']}")
             
             elif intent == 'audit':
                 # Check if content is provided
                 if len(user_input) > 100:  # Likely contains content
                     print("📋 Auditing your content...")
-                    result = agent.audit_content(content=user_input)
+                    result = await agent.audit_content(content=user_input)
                     print(f"\n{result['audit_results']}")
                 else:
                     print("I'd be happy to audit your content!")
                     print("Please paste the content you'd like me to audit:")
-                    content = input("Content: ").strip()
+                    content = (await ainput("Content: ")).strip()
                     if content:
-                        keyword = input("Target keyword (optional): ").strip() or None
-                        result = agent.audit_content(content=content, target_keyword=keyword)
+                        keyword = (await ainput("Target keyword (optional): ")).strip() or None
+                        result = await agent.audit_content(content=content, target_keyword=keyword)
                         print(f"\n{result['audit_results']}")
             
             elif intent == 'meta':
                 print("I can help you generate meta descriptions!")
-                title = input("Page title: ").strip()
+                title = (await ainput("Page title: ")).strip()
                 if title:
-                    content = input("Page content (brief): ").strip()
-                    keyword = input("Target keyword (optional): ").strip() or None
+                    content = (await ainput("Page content (brief): ")).strip()
+                    keyword = (await ainput("Target keyword (optional): ")).strip() or None
                     if content:
-                        result = agent.generate_meta_description(
+                        result = await agent.generate_meta_description(
                             title=title,
                             content=content,
                             target_keyword=keyword
@@ -180,11 +242,11 @@ def chat_loop(agent):
             
             elif intent == 'title':
                 print("I can help you generate title tags!")
-                content = input("Page content (brief): ").strip()
+                content = (await ainput("Page content (brief): ")).strip()
                 if content:
-                    keyword = input("Target keyword: ").strip()
+                    keyword = (await ainput("Target keyword: ")).strip()
                     if keyword:
-                        result = agent.suggest_title_tags(
+                        result = await agent.suggest_title_tags(
                             content=content,
                             target_keyword=keyword
                         )
@@ -194,39 +256,39 @@ def chat_loop(agent):
                 url = extract_url(user_input)
                 if url:
                     print(f"🏆 Analyzing competitor: {url}")
-                    result = agent.analyze_competitor(url)
+                    result = await agent.analyze_competitor(url)
                     print(f"\n{result['analysis']}")
                 else:
                     print("I can analyze competitor SEO!")
-                    url = input("Competitor URL: ").strip()
+                    url = (await ainput("Competitor URL: ")).strip()
                     if url:
                         print("\n🏆 Analyzing...")
-                        result = agent.analyze_competitor(url)
+                        result = await agent.analyze_competitor(url)
                         print(f"\n{result['analysis']}")
             
             elif intent == 'report':
                 url = extract_url(user_input)
                 if url:
                     print(f"📊 Generating SEO report for: {url}")
-                    result = agent.generate_seo_report(url)
+                    result = await agent.generate_seo_report(url)
                     print(f"\n{result['report']}")
                 else:
                     print("I can generate an SEO report!")
-                    url = input("Website URL: ").strip()
+                    url = (await ainput("Website URL: ")).strip()
                     if url:
                         print("\n📊 Generating report...")
-                        result = agent.generate_seo_report(url)
+                        result = await agent.generate_seo_report(url)
                         print(f"\n{result['report']}")
             
             elif intent == 'local':
                 print("I can help with local SEO!")
-                business = input("Business name: ").strip()
+                business = (await ainput("Business name: ")).strip()
                 if business:
-                    location = input("Location (City, State): ").strip()
+                    location = (await ainput("Location (City, State): ")).strip()
                     if location:
-                        business_type = input("Business type: ").strip()
+                        business_type = (await ainput("Business type: ")).strip()
                         if business_type:
-                            result = agent.optimize_for_local_seo(
+                            result = await agent.optimize_for_local_seo(
                                 business_name=business,
                                 location=location,
                                 business_type=business_type
@@ -235,7 +297,7 @@ def chat_loop(agent):
             
             else:
                 # General question - use the agent's Q&A capability
-                answer = agent.answer_seo_question(user_input)
+                answer = await agent.answer_seo_question(user_input)
                 print(f"\n💡 {answer}")
             
             # Store in conversation history
@@ -244,9 +306,6 @@ def chat_loop(agent):
                 'intent': intent
             })
         
-        except KeyboardInterrupt:
-            print("\n\n👋 Thanks for chatting! Goodbye!\n")
-            break
         except EOFError:
             print("\n\n👋 Thanks for chatting! Goodbye!\n")
             break
@@ -255,11 +314,16 @@ def chat_loop(agent):
             print("Please try again or rephrase your question.\n")
 
 
+async def run_chat(agent):
+    """Run the chat loop, closing the agent's client afterwards."""
+    async with agent:
+        await chat_loop(agent)
+
+
 def main():
     """Main function."""
     # Check for API key
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
+    if not API_KEY:
         print("\n❌ Error: OPENAI_API_KEY not found!")
         print("\nPlease set your OpenAI API key:")
         print("1. Create a .env file with: OPENAI_API_KEY=your-api-key-here")
@@ -269,17 +333,27 @@ def main():
     try:
         # Initialize agent
         print("\n⏳ Initializing SEO Expert Agent...")
-        agent = SEOExpertAgent()
+        agent = SEOExpertAgent(api_key=API_KEY)
         print("✅ Agent ready!")
         
         # Print welcome
         print_welcome()
         
         # Start chat loop
-        chat_loop(agent)
+        asyncio.run(run_chat(agent))
     
+    except KeyboardInterrupt:
+        print("\n\n👋 Thanks for chatting! Goodbye!\n")
     except Exception as e:
         print(f"\n❌ Error initializing agent: {e}\n")
+    
+    # A reader stuck in input() holds the stdin lock, and finalizing the
+    # interpreter around it aborts ("_enter_buffered_busy"). Cleanup is done
+    # by now, so leave without teardown.
+    if _input_pending():
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(0)
 
 
 if __name__ == "__main__":
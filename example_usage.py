@@ -4,21 +4,23 @@ Demonstrates various capabilities of the SEO agent.
 """
 
 from seo_agent import SEOExpertAgent
+import asyncio
 import os
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
+API_KEY = os.getenv("OPENAI_API_KEY")
 
 
-def example_keyword_analysis(agent: SEOExpertAgent):
+async def example_keyword_analysis(agent: SEOExpertAgent):
     """Example: Analyze keywords for SEO."""
     print("\n" + "="*70)
     print("EXAMPLE 1: Keyword Analysis")
     print("="*70)
     
     keywords = ["digital marketing", "SEO services", "content marketing"]
-    result = agent.analyze_keywords(
+    result = await agent.analyze_keywords(
         keywords=keywords,
         target_audience="small business owners looking to improve online presence"
     )
@@ -27,7 +29,7 @@ def example_keyword_analysis(agent: SEOExpertAgent):
     print(f"\nAnalysis:\n{result['analysis']}")
 
 
-def example_content_audit(agent: SEOExpertAgent):
+async def example_content_audit(agent: SEOExpertAgent):
     """Example: Audit content for SEO."""
     print("\n" + "="*70)
     print("EXAMPLE 2: Content SEO Audit")
@@ -45,7 +47,7 @@ def example_content_audit(agent: SEOExpertAgent):
     Both frameworks offer excellent documentation and active communities.
     """
     
-    result = agent.audit_content(
+    result = await agent.audit_content(
         content=sample_content,
         target_keyword="python web development",
         url="https://example.com/python-web-development"
@@ -55,13 +57,13 @@ def example_content_audit(agent: SEOExpertAgent):
     print(f"\nAudit Results:\n{result['audit_results']}")
 
 
-def example_meta_description(agent: SEOExpertAgent):
+async def example_meta_description(agent: SEOExpertAgent):
     """Example: Generate meta descriptions."""
     print("\n" + "="*70)
     print("EXAMPLE 3: Generate Meta Descriptions")
     print("="*70)
     
-    result = agent.generate_meta_description(
+    result = await agent.generate_meta_description(
         title="Best SEO Tools for 2024",
         content="Discover the top SEO tools that can help improve your search rankings...",
         target_keyword="SEO tools"
@@ -71,14 +73,14 @@ def example_meta_description(agent: SEOExpertAgent):
     print(f"\nMeta Descriptions:\n{result['meta_descriptions']}")
 
 
-def example_title_tags(agent: SEOExpertAgent):
+async def example_title_tags(agent: SEOExpertAgent):
     """Example: Generate title tag suggestions."""
     print("\n" + "="*70)
     print("EXAMPLE 4: Title Tag Suggestions")
     print("="*70)
     
     content = "Learn how to optimize your website for search engines with our comprehensive SEO guide."
-    result = agent.suggest_title_tags(
+    result = await agent.suggest_title_tags(
         content=content,
         target_keyword="SEO optimization"
     )
@@ -87,26 +89,26 @@ def example_title_tags(agent: SEOExpertAgent):
     print(f"\nTitle Suggestions:\n{result['title_suggestions']}")
 
 
-def example_seo_question(agent: SEOExpertAgent):
+async def example_seo_question(agent: SEOExpertAgent):
     """Example: Ask SEO questions."""
     print("\n" + "="*70)
     print("EXAMPLE 5: Answer SEO Question")
     print("="*70)
     
     question = "What are the most important on-page SEO factors in 2024?"
-    answer = agent.answer_seo_question(question)
+    answer = await agent.answer_seo_question(question)
     
     print(f"\nQ: {question}")
     print(f"\nA: {answer}")
 
 
-def example_local_seo(agent: SEOExpertAgent):
+async def example_local_seo(agent: SEOExpertAgent):
     """Example: Local SEO optimization."""
     print("\n" + "="*70)
     print("EXAMPLE 6: Local SEO Optimization")
     print("="*70)
     
-    result = agent.optimize_for_local_seo(
+    result = await agent.optimize_for_local_seo(
         business_name="Joe's Pizza",
         location="New York, NY",
         business_type="Restaurant"
@@ -117,6 +119,19 @@ def example_local_seo(agent: SEOExpertAgent):
     print(f"\nRecommendations:\n{result['recommendations']}")
 
 
+async def run_examples(agent: SEOExpertAgent):
+    """Run the examples one after another so their output stays in order."""
+    async with agent:
+        await example_keyword_analysis(agent)
+        await example_seo_question(agent)
+        await example_meta_description(agent)
+        await example_title_tags(agent)
+        await example_local_seo(agent)
+        
+        # Uncomment to run content audit (uses API credits)
+        # await example_content_audit(agent)
+
+
 def main():
     """Run all examples."""
     print("\n" + "="*70)
@@ -124,8 +139,7 @@ def main():
     print("="*70)
     
     # Check for API key
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
+    if not API_KEY:
         print("\n❌ Error: OPENAI_API_KEY not found!")
         print("\nPlease set your OpenAI API key:")
         print("1. Create a .env file with: OPENAI_API_KEY=your-api-key-here")
@@ -134,18 +148,11 @@ def main():
     
     try:
         # Initialize the agent
-        agent = SEOExpertAgent()
+        agent = SEOExpertAgent(api_key=API_KEY)
         print("\n✓ SEO Expert Agent initialized successfully")
         
         # Run examples
-        example_keyword_analysis(agent)
-        example_seo_question(agent)
-        example_meta_description(agent)
-        example_title_tags(agent)
-        example_local_seo(agent)
-        
-        # Uncomment to run content audit (uses API credits)
-        # example_content_audit(agent)
+        asyncio.run(run_examples(agent))
         
         print("\n" + "="*70)
         print("All examples completed!")
@@ -3,255 +3,232 @@ Interactive CLI for SEO Expert Agent
 Provides a user-friendly terminal interface to interact with the SEO agent.
 """
 
+import asyncio
 import os
+import shlex
 import sys
 from seo_agent import SEOExpertAgent
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
+API_KEY = os.getenv("OPENAI_API_KEY")
 
 
-def print_header():
-    """Print welcome header."""
-    print("\n" + "="*70)
-    print("🔍 SEO EXPERT AGENT - Interactive Mode")
-    print("="*70)
-    print("Type 'help' for available commands or 'exit' to quit\n")
+def tokenize(line):
+    """Split a command line into words, keeping quoted arguments together."""
+    try:
+        return shlex.split(line)
+    except ValueError:
+        # Unbalanced quotes (e.g. "ask what's a backlink?") - fall back to plain words
+        return line.split()
 
 
-def print_help():
-    """Print help menu."""
-    print("\n" + "-"*70)
-    print("AVAILABLE COMMANDS:")
-    print("-"*70)
-    print("1. keyword <keyword1,keyword2,...> [target_audience]")
-    print("   Example: keyword python,web development developers")
-    print("   Analyze keywords for SEO")
-    print()
-    print("2. audit <content> [target_keyword] [url]")
-    print("   Example: audit 'Your content here' python-web-dev https://example.com")
-    print("   Audit content for SEO")
-    print()
-    print("3. meta <title> <content> [target_keyword]")
-    print("   Example: meta 'Page Title' 'Page content...' keyword")
-    print("   Generate meta descriptions")
-    print()
-    print("4. title <content> <target_keyword>")
-    print("   Example: title 'Your content...' target-keyword")
-    print("   Generate title tag suggestions")
-    print()
-    print("5. competitor <url> [focus_areas]")
-    print("   Example: competitor https://example.com keywords,content")
-    print("   Analyze competitor SEO")
-    print()
-    print("6. report <url> [type]")
-    print("   Example: report https://example.com comprehensive")
-    print("   Generate SEO report (type: comprehensive/quick/technical)")
-    print()
-    print("7. local <business_name> <location> <business_type>")
-    print("   Example: local 'Joe Pizza' 'New York, NY' Restaurant")
-    print("   Get local SEO recommendations")
-    print()
-    print("8. ask <question>")
-    print("   Example: ask What is keyword density?")
-    print("   Ask any SEO question")
-    print()
-    print("9. help - Show this help menu")
-    print("10. exit - Exit the program")
-    print("-"*70 + "\n")
+_HEADER = (
+    "\n" + "="*70 + "\n"
+    "🔍 SEO EXPERT AGENT - Interactive Mode\n"
+    + "="*70 + "\n"
+    "Type 'help' for available commands or 'exit' to quit\n\n"
+)
 
+_HELP_TEXT = (
+    "\n" + "-"*70 + "\n"
+    "AVAILABLE COMMANDS:\n"
+    + "-"*70 + "\n"
+    "1. keyword <keyword1,keyword2,...> [target_audience]\n"
+    "   Example: keyword python,web development developers\n"
+    "   Analyze keywords for SEO\n"
+    "\n"
+    "2. audit <content> [target_keyword] [url]\n"
+    "   Example: audit 'Your content here' python-web-dev https://example.com\n"
+    "   Audit content for SEO\n"
+    "\n"
+    "3. meta <title> <content> [target_keyword]\n"
+    "   Example: meta 'Page Title' 'Page content...' keyword\n"
+    "   Generate meta descriptions\n"
+    "\n"
+    "4. title <content> <target_keyword>\n"
+    "   Example: title 'Your content...' target-keyword\n"
+    "   Generate title tag suggestions\n"
+    "\n"
+    "5. competitor <url> [focus_areas]\n"
+    "   Example: competitor https://example.com keywords,content\n"
+    "   Analyze competitor SEO\n"
+    "\n"
+    "6. report <url> [type]\n"
+    "   Example: report https://example.com comprehensive\n"
+    "   Generate SEO report (type: comprehensive/quick/technical)\n"
+    "\n"
+    "7. local <business_name> <location> <business_type>\n"
+    "   Example: local 'Joe Pizza' 'New York, NY' Restaurant\n"
+    "   Get local SEO recommendations\n"
+    "\n"
+    "8. ask <question>\n"
+    "   Example: ask What is keyword density?\n"
+    "   Ask any SEO question\n"
+    "\n"
+    "9. help - Show this help menu\n"
+    "10. exit - Exit the program\n"
+    + "-"*70 + "\n\n"
+)
 
-def parse_keyword_command(args):
-    """Parse keyword analysis command."""
-    if len(args) < 1:
-        print("❌ Error: Please provide keywords separated by commas")
-        return None
-    
-    keywords = [k.strip() for k in args[0].split(',')]
-    target_audience = ' '.join(args[1:]) if len(args) > 1 else None
-    
-    return {
-        'keywords': keywords,
-        'target_audience': target_audience
-    }
 
+def print_header():
+    """Print welcome header."""
+    sys.stdout.write(_HEADER)
 
-def parse_audit_command(args):
-    """Parse content audit command."""
-    if len(args) < 1:
-        print("❌ Error: Please provide content to audit")
-        return None
-    
-    content = args[0]
-    target_keyword = args[1] if len(args) > 1 else None
-    url = args[2] if len(args) > 2 else None
-    
-    return {
-        'content': content,
-        'target_keyword': target_keyword,
-        'url': url
-    }
 
+def print_help():
+    """Print help menu."""
+    sys.stdout.write(_HELP_TEXT)
 
-def parse_meta_command(args):
-    """Parse meta description command."""
-    if len(args) < 2:
-        print("❌ Error: Please provide title and content")
-        return None
-    
-    title = args[0]
-    content = args[1]
-    target_keyword = args[2] if len(args) > 2 else None
-    
-    return {
-        'title': title,
-        'content': content,
-        'target_keyword': target_keyword
-    }
 
+# Argument kinds: 'word' takes one token, 'csv' splits one token on commas,
+# 'rest' joins every remaining token with spaces
+COMMAND_SPECS = {
+    'keyword': {
+        'fields': [('keywords', 'csv', True), ('target_audience', 'rest', False)],
+        'error': "Please provide keywords separated by commas",
+        'method': 'analyze_keywords',
+        'progress': "Analyzing keywords...",
+        'label': "📊 Keyword Analysis",
+        'result_key': 'analysis',
+    },
+    'audit': {
+        'fields': [('content', 'word', True), ('target_keyword', 'word', False), ('url', 'word', False)],
+        'error': "Please provide content to audit",
+        'method': 'audit_content',
+        'progress': "Auditing content...",
+        'label': "📋 Audit Results",
+        'result_key': 'audit_results',
+    },
+    'meta': {
+        'fields': [('title', 'word', True), ('content', 'word', True), ('target_keyword', 'word', False)],
+        'error': "Please provide title and content",
+        'method': 'generate_meta_description',
+        'progress': "Generating meta descriptions...",
+        'label': "📝 Meta Descriptions",
+        'result_key': 'meta_descriptions',
+    },
+    'title': {
+        'fields': [('content', 'word', True), ('target_keyword', 'word', True)],
+        'error': "Please provide content and target keyword",
+        'method': 'suggest_title_tags',
+        'progress': "Generating title tags...",
+        'label': "📌 Title Suggestions",
+        'result_key': 'title_suggestions',
+    },
+    'competitor': {
+        'fields': [('competitor_url', 'word', True), ('focus_areas', 'csv', False)],
+        'error': "Please provide competitor URL",
+        'method': 'analyze_competitor',
+        'progress': "Analyzing competitor...",
+        'label': "🏆 Competitor Analysis",
+        'result_key': 'analysis',
+    },
+    'report': {
+        'fields': [('website_url', 'word', True), ('analysis_type', 'word', False)],
+        'defaults': {'analysis_type': 'comprehensive'},
+        'error': "Please provide website URL",
+        'method': 'generate_seo_report',
+        'progress': "Generating SEO report...",
+        'label': "📊 SEO Report",
+        'result_key': 'report',
+    },
+    'local': {
+        'fields': [('business_name', 'word', True), ('location', 'word', True), ('business_type', 'rest', True)],
+        'error': "Please provide business_name, location, and business_type",
+        'method': 'optimize_for_local_seo',
+        'progress': "Generating local SEO recommendations...",
+        'label': "📍 Local SEO Recommendations",
+        'result_key': 'recommendations',
+    },
+    'ask': {
+        'fields': [('question', 'rest', True)],
+        'error': "Please provide a question",
+        'method': 'answer_seo_question',
+        'progress': "Thinking...",
+        'label': "💡 Answer",
+        'result_key': None,
+    },
+}
 
-def parse_title_command(args):
-    """Parse title tag command."""
-    if len(args) < 2:
-        print("❌ Error: Please provide content and target keyword")
-        return None
+
+def make_parser(spec):
+    """
+    Build an argument parser from a command spec.
+    The parser returns a kwargs dict for the agent method, or None on bad arity.
+    """
+    fields = spec['fields']
+    defaults = spec.get('defaults', {})
+    required = sum(1 for _, _, is_required in fields if is_required)
+    error = f"❌ Error: {spec['error']}"
     
-    content = args[0]
-    target_keyword = args[1]
+    def parse(args):
+        if len(args) < required:
+            print(error)
+            return None
+        
+        params = {}
+        for index, (name, kind, _) in enumerate(fields):
+            if index >= len(args):
+                params[name] = defaults.get(name)
+            elif kind == 'rest':
+                params[name] = ' '.join(args[index:])
+            elif kind == 'csv':
+                params[name] = [item.strip() for item in args[index].split(',')]
+            else:
+                params[name] = args[index]
+        return params
     
-    return {
-        'content': content,
-        'target_keyword': target_keyword
-    }
+    return parse
 
 
-def parse_competitor_command(args):
-    """Parse competitor analysis command."""
-    if len(args) < 1:
-        print("❌ Error: Please provide competitor URL")
-        return None
+def make_handler(spec):
+    """Build a handler(agent, args) that parses, calls the agent, and prints the result."""
+    parse = make_parser(spec)
+    method, result_key = spec['method'], spec['result_key']
+    progress = f"\n🔍 {spec['progress']}"
+    label = f"\n{spec['label']}:\n"
     
-    url = args[0]
-    focus_areas = args[1].split(',') if len(args) > 1 else None
+    async def handler(agent, args):
+        params = parse(args)
+        if params:
+            print(progress)
+            result = await getattr(agent, method)(**params)
+            output = result if result_key is None else result[result_key]
+            print(f"{label}{output}\n")
     
-    return {
-        'url': url,
-        'focus_areas': focus_areas
-    }
+    return handler
 
 
-def parse_report_command(args):
-    """Parse SEO report command."""
-    if len(args) < 1:
-        print("❌ Error: Please provide website URL")
-        return None
-    
-    url = args[0]
-    analysis_type = args[1] if len(args) > 1 else 'comprehensive'
-    
-    return {
-        'url': url,
-        'analysis_type': analysis_type
-    }
+async def do_help(agent, args):
+    """Show the help menu."""
+    print_help()
 
 
-def parse_local_command(args):
-    """Parse local SEO command."""
-    if len(args) < 3:
-        print("❌ Error: Please provide business_name, location, and business_type")
-        return None
-    
-    business_name = args[0]
-    location = args[1]
-    business_type = ' '.join(args[2:])
-    
-    return {
-        'business_name': business_name,
-        'location': location,
-        'business_type': business_type
-    }
+async def do_exit(agent, args):
+    """Exit the program."""
+    print("\n👋 Goodbye! Happy optimizing!\n")
+    sys.exit(0)
 
 
-def parse_ask_command(args):
-    """Parse ask command."""
-    if len(args) < 1:
-        print("❌ Error: Please provide a question")
-        return None
-    
-    return ' '.join(args)
+# Command name -> handler(agent, args)
+COMMAND_HANDLERS = {name: make_handler(spec) for name, spec in COMMAND_SPECS.items()}
+COMMAND_HANDLERS['help'] = do_help
+COMMAND_HANDLERS['exit'] = do_exit
 
 
-def handle_command(agent, command, args):
+async def handle_command(agent, command, args):
     """Handle user commands."""
-    try:
-        if command == 'keyword':
-            params = parse_keyword_command(args)
-            if params:
-                print("\n🔍 Analyzing keywords...")
-                result = agent.analyze_keywords(**params)
-                print(f"\n📊 Keyword Analysis:\n{result['analysis']}\n")
-        
-        elif command == 'audit':
-            params = parse_audit_command(args)
-            if params:
-                print("\n🔍 Auditing content...")
-                result = agent.audit_content(**params)
-                print(f"\n📋 Audit Results:\n{result['audit_results']}\n")
-        
-        elif command == 'meta':
-            params = parse_meta_command(args)
-            if params:
-                print("\n🔍 Generating meta descriptions...")
-                result = agent.generate_meta_description(**params)
-                print(f"\n📝 Meta Descriptions:\n{result['meta_descriptions']}\n")
-        
-        elif command == 'title':
-            params = parse_title_command(args)
-            if params:
-                print("\n🔍 Generating title tags...")
-                result = agent.suggest_title_tags(**params)
-                print(f"\n📌 Title Suggestions:\n{result['title_suggestions']}\n")
-        
-        elif command == 'competitor':
-            params = parse_competitor_command(args)
-            if params:
-                print("\n🔍 Analyzing competitor...")
-                result = agent.analyze_competitor(**params)
-                print(f"\n🏆 Competitor Analysis:\n{result['analysis']}\n")
-        
-        elif command == 'report':
-            params = parse_report_command(args)
-            if params:
-                print("\n🔍 Generating SEO report...")
-                result = agent.generate_seo_report(**params)
-                print(f"\n📊 SEO Report:\n{result['report']}\n")
-        
-        elif command == 'local':
-            params = parse_local_command(args)
-            if params:
-                print("\n🔍 Generating local SEO recommendations...")
-                result = agent.optimize_for_local_seo(**params)
-                print(f"\n📍 Local SEO Recommendations:\n{result['recommendations']}\n")
-        
-        elif command == 'ask':
-            question = parse_ask_command(args)
-            if question:
-                print("\n🔍 Thinking...")
-                answer = agent.answer_seo_question(question)
-                print(f"\n💡 Answer:\n{answer}\n")
-        
-        elif command == 'help':
-            print_help()
-        
-        elif command == 'exit':
-            print("\n👋 Goodbye! Happy optimizing!\n")
-            sys.exit(0)
-        
-        else:
-            print(f"❌ Unknown command: {command}")
-            print("Type 'help' for available commands\n")
+    handler = COMMAND_HANDLERS.get(command)
+    if handler is None:
+        print(f"❌ Unknown command: {command}")
+        print("Type 'help' for available commands\n")
+        return
     
+    try:
+        await handler(agent, args)
     except Exception as e:
         print(f"\n❌ Error: {str(e)}\n")
 
@@ -259,8 +236,7 @@ def handle_command(agent, command, args):
 def main():
     """Main interactive loop."""
     # Check for API key
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
+    if not API_KEY:
         print("\n❌ Error: OPENAI_API_KEY not found!")
         print("\nPlease set your OpenAI API key:")
         print("1. Create a .env file with: OPENAI_API_KEY=your-api-key-here")
@@ -270,35 +246,45 @@ def main():
     try:
         # Initialize agent
         print("\n⏳ Initializing SEO Expert Agent...")
-        agent = SEOExpertAgent()
+        agent = SEOExpertAgent(api_key=API_KEY)
         print("✅ Agent ready!\n")
         
         # Print header
         print_header()
         
-        # Interactive loop
-        while True:
-            try:
-                # Get user input
-                user_input = input("SEO Agent> ").strip()
-                
-                if not user_input:
-                    continue
-                
-                # Parse command
-                parts = user_input.split(' ', 1)
-                command = parts[0].lower()
-                args = parts[1].split(' ') if len(parts) > 1 else []
+        # One loop for the whole session so the agent's connection pool is reused;
+        # input() stays on the main thread so Ctrl+C is handled as before
+        loop = asyncio.new_event_loop()
+        
+        try:
+            # Interactive loop
+            while True:
+                try:
+                    # Get user input
+                    user_input = input("SEO Agent> ").strip()
+                    
+                    if not user_input:
+                        continue
+                    
+                    # Parse command
+                    tokens = tokenize(user_input)
+                    if not tokens:
+                        continue
+                    command, args = tokens[0].lower(), tokens[1:]
+                    
+                    # Handle command
+                    loop.run_until_complete(handle_command(agent, command, args))
                 
-                # Handle command
-                handle_command(agent, command, args)
-            
-            except KeyboardInterrupt:
-                print("\n\n👋 Goodbye! Happy optimizing!\n")
-                sys.exit(0)
-            except EOFError:
-                print("\n\n👋 Goodbye! Happy optimizing!\n")
-                sys.exit(0)
+                except KeyboardInterrupt:
+                    print("\n\n👋 Goodbye! Happy optimizing!\n")
+                    sys.exit(0)
+                except EOFError:
+                    print("\n\n👋 Goodbye! Happy optimizing!\n")
+                    sys.exit(0)
+        finally:
+            # Exit paths raise SystemExit; close the client's connections first
+            loop.run_until_complete(agent.aclose())
+            loop.close()
     
     except Exception as e:
         print(f"\n❌ Error initializing agent: {e}\n")
@@ -1,14 +1,104 @@
 import os
+import sys
+import queue
+import functools
 import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from typing import List, Dict, Any
+import anyio.to_thread
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
 
 from orca import create_agent_app, ChatMessage, Variables
 from seo_agent import SEO_SYSTEM_PROMPT
 
-load_dotenv()
+if not os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
+    load_dotenv()
+API_KEY = os.getenv("OPENAI_API_KEY")
+DEFAULT_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+THREAD_POOL_SIZE = int(os.getenv("THREAD_POOL_SIZE", "100"))
+STREAM_SINK_WORKERS = int(os.getenv("STREAM_SINK_WORKERS", str(THREAD_POOL_SIZE)))
+
+# Identical for every request; shared rather than rebuilt per message
+_SYSTEM_MESSAGE: Dict[str, str] = {"role": "system", "content": SEO_SYSTEM_PROMPT}
+
+# Each live stream holds one sink worker until it finishes, so sinks get their
+# own pool rather than starving _offload and DNS lookups on the default executor.
+# Streams beyond STREAM_SINK_WORKERS still run; their deltas queue up and are
+# published together once a worker frees up.
+_SINK_EXECUTOR = ThreadPoolExecutor(max_workers=STREAM_SINK_WORKERS, thread_name_prefix="stream-sink")
+
+
+class _StreamSink:
+    """
+    Forwards streamed deltas to an Orca session from one _SINK_EXECUTOR worker.
+
+    session.stream() publishes each chunk with a blocking HTTP call, so the
+    event loop only enqueues deltas and keeps reading from OpenAI. Deltas that
+    pile up while a publish is in flight are sent together in the next one.
+    """
+
+    _DONE = object()
+
+    def __init__(self, session):
+        self._session = session
+        self._queue = queue.SimpleQueue()
+        self._error = None
+        self._worker = None
+
+    def _run(self):
+        done = False
+        while not done:
+            pending = [self._queue.get()]
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            if pending[-1] is self._DONE:
+                pending.pop()
+                done = True
+            if pending and self._error is None:
+                try:
+                    self._session.stream("".join(pending))
+                except Exception as e:
+                    self._error = e
+
+    def send(self, delta: str):
+        self._queue.put_nowait(delta)
+
+    async def __aenter__(self):
+        self._worker = asyncio.get_running_loop().run_in_executor(_SINK_EXECUTOR, self._run)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        # Drain everything queued so far before the caller closes the session
+        self._queue.put_nowait(self._DONE)
+        await self._worker
+        if exc_type is None and self._error is not None:
+            raise self._error
+        return False
+
+
+def _offload(func, *args, **kwargs):
+    """
+    Run a blocking session call on the default executor.
+
+    Session close()/error() POST to the Orca backend. run_in_executor skips
+    the context copy that to_thread adds; these calls read no context variables.
+    """
+    if kwargs:
+        func = functools.partial(func, **kwargs)
+    return asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+async def _drain(stream):
+    """Consume what is left of an OpenAI stream, closing it if that fails."""
+    try:
+        async for _ in stream:
+            pass
+    except Exception:
+        await stream.close()
+
 
 # The factory handles logging, dev_mode detection, and app creation automatically.
 async def process_message(data: ChatMessage):
@@ -22,41 +112,51 @@ async def process_message(data: ChatMessage):
     try:
         # 1. Access variables safely
         vars = Variables(data.variables)
-        api_key = vars.get("OPENAI_API_KEY") or os.getenv("OPENAI_API_KEY")
+        api_key = vars.get("OPENAI_API_KEY") or API_KEY
         
         if not api_key:
-            session.error("OPENAI_API_KEY not found")
+            await _offload(session.error, "OPENAI_API_KEY not found")
             return
 
         # 2. Build messages
-        messages = [
-            {"role": "system", "content": SEO_SYSTEM_PROMPT},
-            {"role": "user", "content": data.message or ""},
-        ]
-
-        # 3. Call OpenAI with streaming
-        client = AsyncOpenAI(api_key=api_key)
-        stream = await client.chat.completions.create(
-            model=data.model or os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-            messages=messages,
-            stream=True,
-            temperature=0.7,
-        )
-
-        session.loading.start("thinking")
+        messages = [_SYSTEM_MESSAGE, {"role": "user", "content": data.message or ""}]
+
+        # 3. Call OpenAI with streaming. The SDK runs each message on a fresh
+        # thread and event loop, and an httpx pool can't outlive the loop that
+        # opened it, so the client is scoped to this message.
+        async with AsyncOpenAI(api_key=api_key) as client:
+            stream = await client.chat.completions.create(
+                model=data.model or DEFAULT_MODEL,
+                messages=messages,
+                stream=True,
+                temperature=0.7,
+            )
+
+            session.loading.start("thinking")
         
-        async for chunk in stream:
-            delta = chunk.choices[0].delta.content or ""
-            if delta:
-                session.stream(delta)
+            async with _StreamSink(session) as sink:
+                async for chunk in stream:
+                    choice = chunk.choices[0]
+                    delta = choice.delta.content or ""
+                    if delta:
+                        sink.send(delta)
+                    if choice.finish_reason:
+                        break
 
-        session.loading.end("thinking")
+            # The answer is complete; read the rest of the response (the [DONE]
+            # marker) while the session closes so the connection goes back to the pool
+            drain = asyncio.create_task(_drain(stream))
+            try:
+                session.loading.end("thinking")
         
-        # 4. Finalize
-        session.close()
+                # 4. Finalize
+                await _offload(session.close)
+            finally:
+                # Only the end-of-stream marker is left, so this is quick even on failure
+                await drain
 
     except Exception as e:
-        session.error("SEO analysis failed", exception=e)
+        await _offload(session.error, "SEO analysis failed", exception=e)
 
 # Create the app and handler using the factory
 app, orca = create_agent_app(
@@ -66,7 +166,31 @@ app, orca = create_agent_app(
     description="Professional SEO Expert Agent powered by Orca SDK."
 )
 
+_sdk_lifespan = app.router.lifespan_context
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    Size the worker thread pools before serving.
+
+    Session close/error calls and FastAPI's sync endpoints run in threads; the
+    defaults (40 anyio tokens, min(32, cpus + 4) executor workers) throttle them
+    under bursty streaming load.
+    """
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREAD_POOL_SIZE
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=THREAD_POOL_SIZE))
+    async with _sdk_lifespan(app) as state:
+        yield state
+
+
+app.router.lifespan_context = lifespan
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 5001))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # uvloop has no Windows build; elsewhere ask for it explicitly so a missing
+    # install fails loudly instead of silently falling back to asyncio.
+    loop = "asyncio" if sys.platform == "win32" else "uvloop"
+    uvicorn.run(app, host="0.0.0.0", port=port, loop=loop, http="httptools", log_level="info")
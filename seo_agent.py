@@ -5,13 +5,15 @@ An intelligent agent that provides SEO analysis, recommendations, and optimizati
 
 import os
 import json
+import asyncio
 from typing import Dict, List, Optional, Any
-from openai import OpenAI
+from openai import AsyncOpenAI, NOT_GIVEN
 from datetime import datetime
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file (Lambda gets them from the runtime)
+if not os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
+    load_dotenv()
 
 # Shared system prompt so other modules (e.g., streaming server) can reuse it
 SEO_SYSTEM_PROMPT = """You are an expert SEO consultant with over 10 years of experience in search engine optimization. 
@@ -29,57 +31,238 @@ You provide actionable, data-driven recommendations based on current SEO best pr
 Always be specific, practical, and prioritize recommendations by impact and effort required."""
 
 
+# Task prompts, formatted per call with only the request-specific fields
+_KEYWORDS_PROMPT = """Analyze the following keywords for SEO purposes:
+Keywords: {keywords_str}
+{audience_context}
+
+Provide a comprehensive analysis including:
+1. Keyword difficulty assessment (Low/Medium/High)
+2. Search volume potential (estimated)
+3. Competition level
+4. Keyword intent (Informational/Commercial/Transactional/Navigational)
+5. Long-tail keyword suggestions
+6. Related keyword opportunities
+7. Content ideas based on these keywords
+
+Format your response as a structured analysis."""
+
+_AUDIT_PROMPT = """Perform a comprehensive SEO audit on the following content:
+{url_context}
+{keyword_context}
+
+Content:
+{content}
+
+Evaluate:
+1. Keyword optimization (density, placement, LSI keywords)
+2. Content quality and readability
+3. On-page SEO elements (headings, meta descriptions, alt text)
+4. Content structure and formatting
+5. Internal linking opportunities
+6. Content length and depth
+7. User intent alignment
+8. Mobile-friendliness considerations
+
+Provide specific, actionable recommendations prioritized by impact."""
+
+_META_DESCRIPTION_PROMPT = """Generate 3 SEO-optimized meta descriptions for:
+Title: {title}
+{keyword_context}
+
+Requirements:
+- 150-160 characters
+- Include a call-to-action
+- Compelling and click-worthy
+- Include target keyword naturally
+- Unique and descriptive
+
+Provide 3 variations with brief explanations for each."""
+
+_TITLE_TAGS_PROMPT = """Generate 5 SEO-optimized title tag options for content targeting the keyword: {target_keyword}
+
+Content preview:
+{content}
+
+Requirements:
+- 50-60 characters
+- Include target keyword near the beginning
+- Compelling and click-worthy
+- Include brand name if relevant
+- Unique and descriptive
+
+Provide 5 variations with brief explanations."""
+
+_COMPETITOR_PROMPT = """Analyze the SEO strategy of this competitor:
+URL: {competitor_url}
+{focus_context}
+
+Analyze:
+1. On-page SEO elements (title, meta description, headings)
+2. Content strategy and quality
+3. Keyword targeting
+4. Internal linking structure
+5. Technical SEO considerations
+6. Content gaps and opportunities
+7. Competitive advantages and weaknesses
+
+Provide actionable insights and opportunities to outperform this competitor."""
+
+_REPORT_PROMPT = """Generate a {analysis_type} SEO report for: {website_url}
+
+Include:
+1. Executive Summary
+2. Technical SEO Audit
+3. On-Page SEO Analysis
+4. Content Quality Assessment
+5. Keyword Performance
+6. Competitor Comparison
+7. Priority Recommendations (High/Medium/Low impact)
+8. Action Plan with timelines
+
+Format as a professional SEO audit report."""
+
+_LOCAL_SEO_PROMPT = """Provide comprehensive local SEO optimization strategy for:
+Business Name: {business_name}
+Location: {location}
+Business Type: {business_type}
+
+Include:
+1. Google Business Profile optimization
+2. Local keyword targeting
+3. NAP (Name, Address, Phone) consistency
+4. Local content strategy
+5. Local link building opportunities
+6. Review management strategy
+7. Local schema markup recommendations
+8. Citation building strategy
+
+Provide actionable, prioritized recommendations."""
+
+
+def _keywords_prompt(keywords: List[str], target_audience: Optional[str] = None) -> str:
+    audience_context = f"Target audience: {target_audience}" if target_audience else ""
+    return _KEYWORDS_PROMPT.format_map({"keywords_str": ", ".join(keywords), "audience_context": audience_context})
+
+
+def _audit_prompt(content: str, target_keyword: Optional[str] = None, url: Optional[str] = None) -> str:
+    keyword_context = f"Target keyword: {target_keyword}" if target_keyword else ""
+    url_context = f"URL: {url}" if url else ""
+    return _AUDIT_PROMPT.format_map({"url_context": url_context, "keyword_context": keyword_context, "content": content[:3000]})
+
+
+def _meta_description_prompt(title: str, target_keyword: Optional[str] = None) -> str:
+    keyword_context = f"Include the keyword: {target_keyword}" if target_keyword else ""
+    return _META_DESCRIPTION_PROMPT.format_map({"title": title, "keyword_context": keyword_context})
+
+
+def _title_tags_prompt(content: str, target_keyword: str) -> str:
+    return _TITLE_TAGS_PROMPT.format_map({"target_keyword": target_keyword, "content": content[:1000]})
+
+
+def _competitor_prompt(competitor_url: str, focus_areas: Optional[List[str]] = None) -> str:
+    focus_context = f"Focus on: {', '.join(focus_areas)}" if focus_areas else "Provide comprehensive analysis"
+    return _COMPETITOR_PROMPT.format_map({"competitor_url": competitor_url, "focus_context": focus_context})
+
+
+def _report_prompt(website_url: str, analysis_type: str = "comprehensive") -> str:
+    return _REPORT_PROMPT.format_map({"analysis_type": analysis_type, "website_url": website_url})
+
+
+def _local_seo_prompt(business_name: str, location: str, business_type: str) -> str:
+    return _LOCAL_SEO_PROMPT.format_map({"business_name": business_name, "location": location, "business_type": business_type})
+
+
+# Sections analyze_bundle() can combine into one request: name -> prompt builder.
+# Builders take the matching agent method's prompt arguments (meta_descriptions
+# takes no content, since the meta prompt is built from the title alone).
+_BUNDLE_SECTIONS = {
+    "keywords": _keywords_prompt,
+    "audit": _audit_prompt,
+    "meta_descriptions": _meta_description_prompt,
+    "title_tags": _title_tags_prompt,
+    "local_seo": _local_seo_prompt,
+}
+
+# analyze_bundle() needs json_schema structured outputs, which the agent's
+# default gpt-4 lacks, so bundles use their own default model
+_BUNDLE_MODEL = "gpt-4o-mini"
+
+
 class SEOExpertAgent:
     """
     An AI-powered SEO expert agent that provides comprehensive SEO analysis and recommendations.
     """
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4", client: Optional[AsyncOpenAI] = None):
         """
         Initialize the SEO Expert Agent.
         
         Args:
             api_key: OpenAI API key. If not provided, will look for OPENAI_API_KEY env variable.
             model: OpenAI model to use (default: gpt-4)
+            client: Existing OpenAI client to share; the caller stays responsible for closing it
         """
-        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
-        if not self.api_key:
-            raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass api_key parameter.")
-        
-        self.client = OpenAI(api_key=self.api_key)
+        if client is not None:
+            self.api_key = client.api_key
+        else:
+            self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+            if not self.api_key:
+                raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass api_key parameter.")
+        
+        self._owns_client = client is None
+        self.client = client or AsyncOpenAI(api_key=self.api_key)
         self.model = model
         self.system_prompt = SEO_SYSTEM_PROMPT
 
+    async def aclose(self):
+        """Close the agent's OpenAI client and its connection pool, unless it was passed in."""
+        if self._owns_client:
+            await self.client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
     @staticmethod
     def get_system_prompt() -> str:
         """Expose the base system prompt for reuse without instantiating the agent."""
         return SEO_SYSTEM_PROMPT
     
-    def _call_openai(self, user_message: str, temperature: float = 0.7) -> str:
+    async def _call_openai(self, user_message: str, temperature: float = 0.7, response_format: Any = NOT_GIVEN, model: Optional[str] = None) -> str:
         """
         Make a call to OpenAI API.
         
         Args:
             user_message: The user's query or request
             temperature: Sampling temperature (0-1)
+            response_format: Optional structured-output format for the response
+            model: Model for this call (default: the agent's model)
             
         Returns:
             The assistant's response
         """
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            response = await self.client.chat.completions.create(
+                model=model or self.model,
                 messages=[
                     {"role": "system", "content": self.system_prompt},
                     {"role": "user", "content": user_message}
                 ],
-                temperature=temperature
+                temperature=temperature,
+                response_format=response_format
             )
-            return response.choices[0].message.content
         except Exception as e:
             raise Exception(f"Error calling OpenAI API: {str(e)}")
+        
+        message = response.choices[0].message
+        if getattr(message, "refusal", None):
+            raise Exception(f"OpenAI refused the request: {message.refusal}")
+        return message.content
     
-    def analyze_keywords(self, keywords: List[str], target_audience: Optional[str] = None) -> Dict[str, Any]:
+    async def analyze_keywords(self, keywords: List[str], target_audience: Optional[str] = None) -> Dict[str, Any]:
         """
         Analyze keywords and provide SEO insights.
         
@@ -90,25 +273,9 @@ class SEOExpertAgent:
         Returns:
             Dictionary with keyword analysis and recommendations
         """
-        keywords_str = ", ".join(keywords)
-        audience_context = f"Target audience: {target_audience}" if target_audience else ""
-        
-        prompt = f"""Analyze the following keywords for SEO purposes:
-Keywords: {keywords_str}
-{audience_context}
-
-Provide a comprehensive analysis including:
-1. Keyword difficulty assessment (Low/Medium/High)
-2. Search volume potential (estimated)
-3. Competition level
-4. Keyword intent (Informational/Commercial/Transactional/Navigational)
-5. Long-tail keyword suggestions
-6. Related keyword opportunities
-7. Content ideas based on these keywords
-
-Format your response as a structured analysis."""
+        prompt = _keywords_prompt(keywords, target_audience)
         
-        analysis = self._call_openai(prompt, temperature=0.5)
+        analysis = await self._call_openai(prompt, temperature=0.5)
         
         return {
             "keywords": keywords,
@@ -116,7 +283,7 @@ Format your response as a structured analysis."""
             "timestamp": datetime.now().isoformat()
         }
     
-    def audit_content(self, content: str, target_keyword: Optional[str] = None, url: Optional[str] = None) -> Dict[str, Any]:
+    async def audit_content(self, content: str, target_keyword: Optional[str] = None, url: Optional[str] = None) -> Dict[str, Any]:
         """
         Perform SEO audit on content.
         
@@ -128,29 +295,9 @@ Format your response as a structured analysis."""
         Returns:
             Dictionary with audit results and recommendations
         """
-        keyword_context = f"Target keyword: {target_keyword}" if target_keyword else ""
-        url_context = f"URL: {url}" if url else ""
+        prompt = _audit_prompt(content, target_keyword, url)
         
-        prompt = f"""Perform a comprehensive SEO audit on the following content:
-{url_context}
-{keyword_context}
-
-Content:
-{content[:3000]}  # Limit content length
-
-Evaluate:
-1. Keyword optimization (density, placement, LSI keywords)
-2. Content quality and readability
-3. On-page SEO elements (headings, meta descriptions, alt text)
-4. Content structure and formatting
-5. Internal linking opportunities
-6. Content length and depth
-7. User intent alignment
-8. Mobile-friendliness considerations
-
-Provide specific, actionable recommendations prioritized by impact."""
-        
-        audit_results = self._call_openai(prompt, temperature=0.5)
+        audit_results = await self._call_openai(prompt, temperature=0.5)
         
         return {
             "content_preview": content[:500],
@@ -160,7 +307,7 @@ Provide specific, actionable recommendations prioritized by impact."""
             "timestamp": datetime.now().isoformat()
         }
     
-    def generate_meta_description(self, title: str, content: str, target_keyword: Optional[str] = None) -> Dict[str, Any]:
+    async def generate_meta_description(self, title: str, content: str, target_keyword: Optional[str] = None) -> Dict[str, Any]:
         """
         Generate SEO-optimized meta description.
         
@@ -172,22 +319,9 @@ Provide specific, actionable recommendations prioritized by impact."""
         Returns:
             Dictionary with meta description options
         """
-        keyword_context = f"Include the keyword: {target_keyword}" if target_keyword else ""
-        
-        prompt = f"""Generate 3 SEO-optimized meta descriptions for:
-Title: {title}
-{keyword_context}
-
-Requirements:
-- 150-160 characters
-- Include a call-to-action
-- Compelling and click-worthy
-- Include target keyword naturally
-- Unique and descriptive
-
-Provide 3 variations with brief explanations for each."""
+        prompt = _meta_description_prompt(title, target_keyword)
         
-        meta_descriptions = self._call_openai(prompt, temperature=0.8)
+        meta_descriptions = await self._call_openai(prompt, temperature=0.8)
         
         return {
             "title": title,
@@ -196,7 +330,7 @@ Provide 3 variations with brief explanations for each."""
             "timestamp": datetime.now().isoformat()
         }
     
-    def suggest_title_tags(self, content: str, target_keyword: str) -> Dict[str, Any]:
+    async def suggest_title_tags(self, content: str, target_keyword: str) -> Dict[str, Any]:
         """
         Suggest optimized title tags.
         
@@ -207,21 +341,9 @@ Provide 3 variations with brief explanations for each."""
         Returns:
             Dictionary with title tag suggestions
         """
-        prompt = f"""Generate 5 SEO-optimized title tag options for content targeting the keyword: {target_keyword}
-
-Content preview:
-{content[:1000]}
-
-Requirements:
-- 50-60 characters
-- Include target keyword near the beginning
-- Compelling and click-worthy
-- Include brand name if relevant
-- Unique and descriptive
-
-Provide 5 variations with brief explanations."""
+        prompt = _title_tags_prompt(content, target_keyword)
         
-        title_suggestions = self._call_openai(prompt, temperature=0.8)
+        title_suggestions = await self._call_openai(prompt, temperature=0.8)
         
         return {
             "target_keyword": target_keyword,
@@ -229,7 +351,7 @@ Provide 5 variations with brief explanations."""
             "timestamp": datetime.now().isoformat()
         }
     
-    def analyze_competitor(self, competitor_url: str, focus_areas: Optional[List[str]] = None) -> Dict[str, Any]:
+    async def analyze_competitor(self, competitor_url: str, focus_areas: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Analyze competitor SEO strategy.
         
@@ -240,24 +362,9 @@ Provide 5 variations with brief explanations."""
         Returns:
             Dictionary with competitor analysis
         """
-        focus_context = f"Focus on: {', '.join(focus_areas)}" if focus_areas else "Provide comprehensive analysis"
-        
-        prompt = f"""Analyze the SEO strategy of this competitor:
-URL: {competitor_url}
-{focus_context}
-
-Analyze:
-1. On-page SEO elements (title, meta description, headings)
-2. Content strategy and quality
-3. Keyword targeting
-4. Internal linking structure
-5. Technical SEO considerations
-6. Content gaps and opportunities
-7. Competitive advantages and weaknesses
-
-Provide actionable insights and opportunities to outperform this competitor."""
+        prompt = _competitor_prompt(competitor_url, focus_areas)
         
-        analysis = self._call_openai(prompt, temperature=0.5)
+        analysis = await self._call_openai(prompt, temperature=0.5)
         
         return {
             "competitor_url": competitor_url,
@@ -266,7 +373,7 @@ Provide actionable insights and opportunities to outperform this competitor."""
             "timestamp": datetime.now().isoformat()
         }
     
-    def generate_seo_report(self, website_url: str, analysis_type: str = "comprehensive") -> Dict[str, Any]:
+    async def generate_seo_report(self, website_url: str, analysis_type: str = "comprehensive") -> Dict[str, Any]:
         """
         Generate comprehensive SEO report.
         
@@ -277,21 +384,9 @@ Provide actionable insights and opportunities to outperform this competitor."""
         Returns:
             Dictionary with SEO report
         """
-        prompt = f"""Generate a {analysis_type} SEO report for: {website_url}
-
-Include:
-1. Executive Summary
-2. Technical SEO Audit
-3. On-Page SEO Analysis
-4. Content Quality Assessment
-5. Keyword Performance
-6. Competitor Comparison
-7. Priority Recommendations (High/Medium/Low impact)
-8. Action Plan with timelines
-
-Format as a professional SEO audit report."""
+        prompt = _report_prompt(website_url, analysis_type)
         
-        report = self._call_openai(prompt, temperature=0.5)
+        report = await self._call_openai(prompt, temperature=0.5)
         
         return {
             "website_url": website_url,
@@ -300,7 +395,7 @@ Format as a professional SEO audit report."""
             "timestamp": datetime.now().isoformat()
         }
     
-    def answer_seo_question(self, question: str) -> str:
+    async def answer_seo_question(self, question: str) -> str:
         """
         Answer any SEO-related question.
         
@@ -310,9 +405,9 @@ Format as a professional SEO audit report."""
         Returns:
             Detailed answer from the SEO expert
         """
-        return self._call_openai(question, temperature=0.7)
+        return await self._call_openai(question, temperature=0.7)
     
-    def optimize_for_local_seo(self, business_name: str, location: str, business_type: str) -> Dict[str, Any]:
+    async def optimize_for_local_seo(self, business_name: str, location: str, business_type: str) -> Dict[str, Any]:
         """
         Provide local SEO optimization recommendations.
         
@@ -324,24 +419,9 @@ Format as a professional SEO audit report."""
         Returns:
             Dictionary with local SEO recommendations
         """
-        prompt = f"""Provide comprehensive local SEO optimization strategy for:
-Business Name: {business_name}
-Location: {location}
-Business Type: {business_type}
-
-Include:
-1. Google Business Profile optimization
-2. Local keyword targeting
-3. NAP (Name, Address, Phone) consistency
-4. Local content strategy
-5. Local link building opportunities
-6. Review management strategy
-7. Local schema markup recommendations
-8. Citation building strategy
-
-Provide actionable, prioritized recommendations."""
+        prompt = _local_seo_prompt(business_name, location, business_type)
         
-        recommendations = self._call_openai(prompt, temperature=0.6)
+        recommendations = await self._call_openai(prompt, temperature=0.6)
         
         return {
             "business_name": business_name,
@@ -350,6 +430,93 @@ Provide actionable, prioritized recommendations."""
             "recommendations": recommendations,
             "timestamp": datetime.now().isoformat()
         }
+    
+    async def analyze_bundle(self, spec: Dict[str, Dict[str, Any]], model: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run several analyses in a single OpenAI call using structured outputs.
+        
+        Args:
+            spec: Section name -> prompt arguments of the matching method, e.g.
+                {"keywords": {"keywords": [...]}, "meta_descriptions": {"title": ...}}.
+                Sections: keywords, audit, meta_descriptions, title_tags, local_seo.
+            model: Model for this call (default: gpt-4o-mini). Must support
+                json_schema structured outputs.
+            
+        Returns:
+            Dictionary with one text result per requested section
+        """
+        if not spec:
+            raise ValueError("analyze_bundle needs at least one section")
+        
+        unknown = set(spec) - set(_BUNDLE_SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown bundle sections: {', '.join(sorted(unknown))}")
+        
+        tasks = "\n\n".join(
+            f"## Task: {name}\n{_BUNDLE_SECTIONS[name](**kwargs)}" for name, kwargs in spec.items()
+        )
+        prompt = (
+            "Complete each of the following SEO tasks. Put the full answer to each task, "
+            "as markdown text, in the JSON field named after the task.\n\n" + tasks
+        )
+        response_format = {
+            "type": "json_schema",
+            "json_schema": {
+                "name": "seo_bundle",
+                "strict": True,
+                "schema": {
+                    "type": "object",
+                    "properties": {name: {"type": "string"} for name in spec},
+                    "required": list(spec),
+                    "additionalProperties": False,
+                },
+            },
+        }
+        
+        content = await self._call_openai(prompt, temperature=0.5, response_format=response_format, model=model or _BUNDLE_MODEL)
+        if content is None:
+            raise Exception("OpenAI returned no structured output for the bundle")
+        results = json.loads(content)
+        results["timestamp"] = datetime.now().isoformat()
+        return results
+
+
+async def run_examples(agent: SEOExpertAgent):
+    """Run the example requests concurrently and print their results."""
+    keywords = ["python programming", "web development"]
+    question = "What is the ideal keyword density for SEO?"
+    
+    # The three requests are independent, so they share one round of latency
+    async with agent:
+        result, answer, meta_result = await asyncio.gather(
+            agent.analyze_keywords(keywords, target_audience="developers"),
+            agent.answer_seo_question(question),
+            agent.generate_meta_description(
+                title="Python Web Development Guide",
+                content="Learn Python web development with Flask and Django",
+                target_keyword="python web development"
+            ),
+        )
+    
+    # Example 1: Keyword Analysis
+    print("=" * 60)
+    print("Example 1: Keyword Analysis")
+    print("=" * 60)
+    print(f"Analyzed keywords: {keywords}")
+    print(f"\nAnalysis:\n{result['analysis']}\n")
+    
+    # Example 2: Answer SEO Question
+    print("=" * 60)
+    print("Example 2: Answer SEO Question")
+    print("=" * 60)
+    print(f"Q: {question}")
+    print(f"A: {answer}\n")
+    
+    # Example 3: Generate Meta Description
+    print("=" * 60)
+    print("Example 3: Generate Meta Description")
+    print("=" * 60)
+    print(f"Meta Descriptions:\n{meta_result['meta_descriptions']}\n")
 
 
 def main():
@@ -362,33 +529,7 @@ def main():
         agent = SEOExpertAgent()
         print("✓ SEO Expert Agent initialized successfully\n")
         
-        # Example 1: Keyword Analysis
-        print("=" * 60)
-        print("Example 1: Keyword Analysis")
-        print("=" * 60)
-        keywords = ["python programming", "web development"]
-        result = agent.analyze_keywords(keywords, target_audience="developers")
-        print(f"Analyzed keywords: {keywords}")
-        print(f"\nAnalysis:\n{result['analysis']}\n")
-        
-        # Example 2: Answer SEO Question
-        print("=" * 60)
-        print("Example 2: Answer SEO Question")
-        print("=" * 60)
-        answer = agent.answer_seo_question("What is the ideal keyword density for SEO?")
-        print(f"Q: What is the ideal keyword density for SEO?")
-        print(f"A: {answer}\n")
-        
-        # Example 3: Generate Meta Description
-        print("=" * 60)
-        print("Example 3: Generate Meta Description")
-        print("=" * 60)
-        meta_result = agent.generate_meta_description(
-            title="Python Web Development Guide",
-            content="Learn Python web development with Flask and Django",
-            target_keyword="python web development"
-        )
-        print(f"Meta Descriptions:\n{meta_result['meta_descriptions']}\n")
+        asyncio.run(run_examples(agent))
         
     except ValueError as e:
         print(f"Error: {e}")